@@ -1,8 +1,63 @@
 #!/usr/bin/env python3
 import ipaddress
-from typing import List
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Union
 
-def print_banner():
+# Разделителни линии за менюто и резултатите
+_DIV50 = '-' * 50
+_DIV20 = '-' * 20
+
+# Двоичните маски на IPv4 зависят само от префикса, затова се изчисляват веднъж
+_MASK_BINARY = tuple('1' * prefix + '0' * (32 - prefix) for prefix in range(33))
+
+# Етикети за показване на полетата на NetworkInfo, в същия ред
+_DISPLAY_LABELS = (
+    "Версия", "Мрежов адрес", "Broadcast адрес", "Маска", "Префикс дължина",
+    "Start IP", "End IP", "Брой адреси", "Първи използваем", "Последен използваем",
+    "Start IP (binary)", "End IP (binary)", "Маска (binary)"
+)
+
+class NetworkInfo(NamedTuple):
+    """
+    Резултат от analyze_network - по едно поле за всеки ред от анализа.
+    Двоичните полета са празни за IPv6
+    """
+    version: str
+    network: str
+    broadcast: str
+    netmask: str
+    prefixlen: int
+    start_ip: str
+    end_ip: str
+    num_addresses: int
+    first_usable: str
+    last_usable: str
+    start_bin: str = ''
+    end_bin: str = ''
+    mask_bin: str = ''
+
+    def to_display_dict(self) -> Dict[str, Union[str, int]]:
+        """
+        Връща полетата с етикетите, които се показват на потребителя
+        """
+        result: Dict[str, Union[str, int]] = dict(zip(_DISPLAY_LABELS, self))
+        # Двоичните полета се показват само за IPv4
+        if not self.mask_bin:
+            for label in _DISPLAY_LABELS[-3:]:
+                del result[label]
+        return result
+
+# Шаблон за един блок в режим 2 (цветовете са вградени веднъж)
+_BLOCK_TEMPLATE = (
+    "\033[96m{0}. {1}\033[0m\n"
+    "   Брой адреси: {2}\n"
+    "   Start IP: {3}\n"
+    "   End IP: {4}\n"
+    "\n"
+)
+
+def print_banner() -> None:
     """
     Отпечатва красиво банер със заглавието на програмата
     """
@@ -14,62 +69,102 @@ def print_banner():
     print("╚══════════════════════════════════════════════╝")
     print("\033[0m")  # Връщане към нормален цвят
 
-def analyze_network(cidr_notation):
+@lru_cache(maxsize=1024)
+def analyze_network(cidr_notation: str) -> NetworkInfo:
     """
-    Анализира CIDR нотация и връща информация за мрежата
+    Анализира CIDR нотация и връща информация за мрежата като NetworkInfo
+    Успешните резултати се кешират; при невалиден вход хвърля ValueError
     """
-    try:
-        network = ipaddress.ip_network(cidr_notation, strict=False)
-        
-        # Намираме първия и последния IP адрес в мрежата
-        start_ip = network[0]
-        end_ip = network[-1]
-        
-        result = {
-            "Версия": "IPv6" if network.version == 6 else "IPv4",
-            "Мрежов адрес": str(network.network_address),
-            "Broadcast адрес": str(network.broadcast_address) if network.version == 4 else "N/A",
-            "Маска": str(network.netmask),
-            "Префикс дължина": network.prefixlen,
-            "Start IP": str(start_ip),
-            "End IP": str(end_ip),
-            "Брой адреси": network.num_addresses,
-            "Първи използваем": str(network[1]) if network.num_addresses > 2 else "N/A",
-            "Последен използваем": str(network[-2]) if network.num_addresses > 2 else "N/A"
-        }
-        
-        # Добавяме двоичен формат за IPv4
-        if network.version == 4:
-            result["Start IP (binary)"] = format(int(start_ip), '032b')
-            result["End IP (binary)"] = format(int(end_ip), '032b')
-            result["Маска (binary)"] = format(int(network.netmask), '032b')
-        
-        return result
-    except ValueError as e:
-        return {"Грешка": str(e)}
+    network = ipaddress.ip_network(cidr_notation, strict=False)
+    
+    # Първият и последният адрес вече са изчислени в мрежовия обект
+    start_ip = network.network_address
+    end_ip = network.broadcast_address
+    usable = network.num_addresses > 2
+    
+    # Всеки адрес се превръща в стринг само веднъж
+    start_s = str(start_ip)
+    end_s = str(end_ip)
+    
+    # Двоичен формат само за IPv4
+    if network.version == 4:
+        binary = (f'{int(start_ip):032b}', f'{int(end_ip):032b}', _MASK_BINARY[network.prefixlen])
+    else:
+        binary = ('', '', '')
+    
+    return NetworkInfo(
+        version="IPv6" if network.version == 6 else "IPv4",
+        network=start_s,
+        broadcast=end_s if network.version == 4 else "N/A",
+        netmask=str(network.netmask),
+        prefixlen=network.prefixlen,
+        start_ip=start_s,
+        end_ip=end_s,
+        num_addresses=network.num_addresses,
+        first_usable=str(start_ip + 1) if usable else "N/A",
+        last_usable=str(end_ip - 1) if usable else "N/A",
+        start_bin=binary[0],
+        end_bin=binary[1],
+        mask_bin=binary[2]
+    )
 
-def calculate_optimal_cidrs(start_ip: str, end_ip: str) -> List[str]:
+def bulk_analyze(cidrs: Iterable[str]) -> List[Union[NetworkInfo, ValueError]]:
+    """
+    Анализира наведнъж списък от CIDR нотации чрез кешираната analyze_network
+    Връща по един NetworkInfo за всеки ред; за невалиден вход на мястото му
+    стои самата ValueError, за да не се губи съответствието с входа
+    """
+    results: List[Union[NetworkInfo, ValueError]] = []
+    for cidr in cidrs:
+        try:
+            results.append(analyze_network(cidr))
+        except ValueError as e:
+            results.append(e)
+    return results
+
+def calculate_optimal_cidrs(start_ip: str, end_ip: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
     """
     Изчислява оптималните CIDR блокове между два IP адреса
+    Връща самите мрежови обекти, за да не се парсват отново при извеждане;
+    при невалиден вход хвърля ValueError
     """
-    try:
-        start = ipaddress.ip_address(start_ip)
-        end = ipaddress.ip_address(end_ip)
-        
-        if start.version != end.version:
-            raise ValueError("Start IP и End IP трябва да са от един и същ тип (IPv4 или IPv6)")
+    start = ipaddress.ip_address(start_ip)
+    end = ipaddress.ip_address(end_ip)
+    
+    if start.version != end.version:
+        raise ValueError("Start IP и End IP трябва да са от един и същ тип (IPv4 или IPv6)")
+    
+    # Версиите вече съвпадат, затова сравняваме целочислените стойности
+    if int(start) > int(end):
+        start, end = end, start
         
-        if start > end:
-            start, end = end, start
-            
-        networks = [str(net) for net in ipaddress.summarize_address_range(start, end)]
-        return networks
-    except ValueError as e:
-        return [f"Грешка: {str(e)}"]
+    return list(ipaddress.summarize_address_range(start, end))
 
-def main():
+def run_batch(binary: bool = False) -> None:
+    """
+    Неинтерактивен режим (--batch): чете CIDR нотации от stdin, по една на ред,
+    анализира ги наведнъж и записва по един ред с резултат в stdout
+    С binary=True (--binary) за IPv4 се добавят и трите двоични колони
+    """
+    cidrs = [line.strip() for line in sys.stdin.read().splitlines() if line.strip()]
+
+    lines = []
+    for cidr, result in zip(cidrs, bulk_analyze(cidrs)):
+        if isinstance(result, ValueError):
+            lines.append(f"{cidr}\tГрешка: {result}")
+            continue
+        line = f"{result.network}/{result.prefixlen}\t{result.num_addresses}\t{result.start_ip}\t{result.end_ip}"
+        # Двоичните полета са попълнени само за IPv4
+        if binary and result.mask_bin:
+            line += f"\t{result.start_bin}\t{result.end_bin}\t{result.mask_bin}"
+        lines.append(line)
+
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+def main() -> None:
     print_banner()
-    print("-" * 50)
+    print(_DIV50)
     
     while True:
         print("\nИзберете режим:")
@@ -89,38 +184,45 @@ def main():
             if not cidr:
                 continue
                 
-            result = analyze_network(cidr)
-            
-            if "Грешка" in result:
-                print(f"\n\033[91mГрешка: {result['Грешка']}\033[0m")
+            try:
+                result = analyze_network(cidr)
+            except ValueError as e:
+                print(f"\n\033[91mГрешка: {str(e)}\033[0m")
                 continue
                 
             print("\n\033[92mРезултати:\033[0m")
-            print("-" * 20)
-            for key, value in result.items():
+            print(_DIV20)
+            for key, value in result.to_display_dict().items():
                 print(f"\033[96m{key}:\033[0m {value}")
                 
         elif choice == "2":
             start_ip = input("\nВъведете начален IP адрес: ")
             end_ip = input("Въведете краен IP адрес: ")
             
-            cidrs = calculate_optimal_cidrs(start_ip, end_ip)
-            
             print("\n\033[92mОптимални CIDR блокове:\033[0m")
-            print("-" * 20)
-            if cidrs and cidrs[0].startswith("Грешка"):
-                print(f"\033[91m{cidrs[0]}\033[0m")
-            else:
-                for i, cidr in enumerate(cidrs, 1):
-                    print(f"\033[96m{i}. {cidr}\033[0m")
-                    result = analyze_network(cidr)
-                    if "Грешка" not in result:
-                        print(f"   Брой адреси: {result['Брой адреси']}")
-                        print(f"   Start IP: {result['Start IP']}")
-                        print(f"   End IP: {result['End IP']}")
-                        print()
+            print(_DIV20)
+            try:
+                cidrs = calculate_optimal_cidrs(start_ip, end_ip)
+            except ValueError as e:
+                print(f"\033[91mГрешка: {str(e)}\033[0m")
+                continue
+
+            # Целият списък се сглобява и извежда с едно писане в stdout
+            out = [
+                _BLOCK_TEMPLATE.format(i, network, network.num_addresses,
+                                       network.network_address, network.broadcast_address)
+                for i, network in enumerate(cidrs, 1)
+            ]
+            sys.stdout.write(''.join(out))
         else:
             print("\n\033[91mНевалиден избор. Моля, изберете 1, 2 или 3.\033[0m")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = sys.argv[1:]
+    if "--batch" in args:
+        run_batch(binary="--binary" in args)
+    elif "--binary" in args:
+        sys.exit("Употреба: python cidr_calculator.py --batch [--binary] < файл\n"
+                 "--binary се използва само заедно с --batch")
+    else:
+        main() 
\ No newline at end of file
@@ -1,99 +1,139 @@
 #!/usr/bin/env python3
-from typing import List, Dict, Union, Tuple
+from typing import Callable, FrozenSet, Iterable, List, Dict, Mapping, Optional, Sequence, SupportsIndex, Union, Tuple
+from functools import lru_cache, total_ordering
+from types import MappingProxyType
+import operator
 import re
+import socket
+import sys
 
+# Разделителна линия за резултатите
+_DIV40 = '-' * 40
+
+# IP адрес и числов префикс, разделени с точно една наклонена черта
+_CIDR_RE = re.compile(r'([^/]+)/([0-9]+)')
+
+# Предварително изчислени маски за всеки префикс (0..32 за IPv4, 0..128 за IPv6)
+_V4_NETMASK = tuple(((1 << 32) - 1) ^ ((1 << (32 - prefix)) - 1) for prefix in range(33))
+_V4_HOSTSIZE = tuple(1 << (32 - prefix) for prefix in range(33))
+_V6_NETMASK = tuple(((1 << 128) - 1) ^ ((1 << (128 - prefix)) - 1) for prefix in range(129))
+_V6_HOSTSIZE = tuple(1 << (128 - prefix) for prefix in range(129))
+
+@total_ordering
 class IP:
-    def __init__(self, ip_str: str):
-        """Инициализира IP адрес от стринг"""
-        self.original_str = ip_str
-        self.version = 6 if ':' in ip_str else 4
-        self.ip_int = self._to_integer(ip_str)
-
-    def _to_integer(self, ip_str: str) -> int:
-        """Конвертира IP адрес в цяло число"""
-        if self.version == 4:
-            return self._ipv4_to_int(ip_str)
-        return self._ipv6_to_int(ip_str)
+    __slots__ = ('_original_str', 'version', 'ip_int', '_bits', '_to_str', '_key')
+    _original_str: Optional[str]
+    version: int
+    ip_int: int
+    _bits: int
+    _to_str: Callable[[int], str]
+    # Ключ (версия, число), изчислен веднъж за сравнение и хеширане
+    _key: Tuple[int, int]
+
+    def __init__(self, ip: Union[str, int], version: int = 4) -> None:
+        """
+        Инициализира IP адрес от стринг или от вече изчислено цяло число
+        При цяло число версията се подава изрично и стрингът не се парсва
+        """
+        if isinstance(ip, int):
+            if version != 4 and version != 6:
+                raise ValueError("Версията трябва да бъде 4 или 6")
+            self._original_str = None
+            self._set_version(version)
+            if not (0 <= ip < 1 << self._bits):
+                raise ValueError(f"Невалиден IPv{version} адрес: {ip}")
+            self.ip_int = ip
+        else:
+            self._original_str = ip
+            if ':' in ip:
+                self._set_version(6)
+                self.ip_int = self._ipv6_to_int(ip)
+            else:
+                self._set_version(4)
+                self.ip_int = self._ipv4_to_int(ip)
+        self._key = (self.version, self.ip_int)
+
+    @property
+    def original_str(self) -> str:
+        """Въведеният стринг; за адреси от цяло число се форматира при първо използване"""
+        if self._original_str is None:
+            self._original_str = self._to_str(self.ip_int)
+        return self._original_str
+
+    def _set_version(self, version: int) -> None:
+        """Запомня версията и избира веднъж дължината и форматиращата функция"""
+        self.version = version
+        if version == 4:
+            self._bits = 32
+            self._to_str = IP._int_to_ipv4_str
+        else:
+            self._bits = 128
+            self._to_str = IP._int_to_ipv6_str
 
     def _ipv4_to_int(self, ip_str: str) -> int:
         """Конвертира IPv4 адрес в цяло число"""
-        parts = ip_str.split('.')
-        if len(parts) != 4:
-            raise ValueError("Невалиден IPv4 адрес")
-        
-        result = 0
-        for part in parts:
-            octet = int(part)
-            if not (0 <= octet <= 255):
-                raise ValueError(f"Невалидна стойност за октет: {octet}")
-            result = (result << 8) + octet
-        return result
+        # inet_pton валидира строго (точно 4 десетични октета 0-255) в едно C извикване
+        try:
+            packed = socket.inet_pton(socket.AF_INET, ip_str)
+        except OSError:
+            raise ValueError(f"Невалиден IPv4 адрес: {ip_str}")
+        return int.from_bytes(packed, 'big')
 
     def _ipv6_to_int(self, ip_str: str) -> int:
         """Конвертира IPv6 адрес в цяло число"""
-        # Разширяване на съкратен IPv6 адрес
-        if '::' in ip_str:
-            missing_count = 8 - ip_str.count(':') + 1
-            ip_str = ip_str.replace('::', ':' + ':0' * missing_count + ':')
-            if ip_str.startswith(':'):
-                ip_str = '0' + ip_str
-            if ip_str.endswith(':'):
-                ip_str = ip_str + '0'
-
-        parts = ip_str.split(':')
-        if len(parts) != 8:
-            raise ValueError("Невалиден IPv6 адрес")
-
-        result = 0
-        for part in parts:
-            if not part:
-                raise ValueError("Невалиден IPv6 адрес")
-            hex_val = int(part, 16)
-            if not (0 <= hex_val <= 0xFFFF):
-                raise ValueError(f"Невалидна стойност за IPv6 част: {part}")
-            result = (result << 16) + hex_val
-        return result
+        # inet_pton обработва всички форми на '::' и вграден IPv4 в едно C извикване
+        try:
+            return int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_str), 'big')
+        except OSError:
+            raise ValueError(f"Невалиден IPv6 адрес: {ip_str}")
 
     def to_binary(self) -> str:
         """Връща IP адреса в двоичен формат"""
         if self.version == 4:
-            return format(self.ip_int, '032b')
-        return format(self.ip_int, '0128b')
+            return f'{self.ip_int:032b}'
+        return f'{self.ip_int:0128b}'
 
     def __str__(self) -> str:
         """Връща IP адреса като стринг"""
-        if self.version == 4:
-            return self._int_to_ipv4_str(self.ip_int)
-        return self._int_to_ipv6_str(self.ip_int)
+        return self._to_str(self.ip_int)
 
     @staticmethod
     def _int_to_ipv4_str(ip_int: int) -> str:
         """Конвертира цяло число в IPv4 стринг"""
-        octets = []
-        for _ in range(4):
-            octets.insert(0, str(ip_int & 255))
-            ip_int >>= 8
-        return '.'.join(octets)
+        return socket.inet_ntoa((ip_int & 0xFFFFFFFF).to_bytes(4, 'big'))
 
     @staticmethod
     def _int_to_ipv6_str(ip_int: int) -> str:
-        """Конвертира цяло число в IPv6 стринг"""
-        parts = []
-        for _ in range(8):
-            parts.insert(0, format(ip_int & 0xFFFF, '04x'))
-            ip_int >>= 16
-        return ':'.join(parts)
+        """Конвертира цяло число в IPv6 стринг (съкратен запис по RFC 5952)"""
+        return socket.inet_ntop(socket.AF_INET6, (ip_int & ((1 << 128) - 1)).to_bytes(16, 'big'))
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, IP):
+            return NotImplemented
+        return self._key < other._key
 
-    def __lt__(self, other) -> bool:
-        return self.ip_int < other.ip_int
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, IP):
+            return NotImplemented
+        return self._key <= other._key
 
-    def __le__(self, other) -> bool:
-        return self.ip_int <= other.ip_int
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IP):
+            return NotImplemented
+        return self._key == other._key
 
-    def __eq__(self, other) -> bool:
-        return self.ip_int == other.ip_int
+    def __hash__(self) -> int:
+        return hash(self._key)
 
 class Network:
+    __slots__ = ('ip', 'prefix_length', 'netmask_int', 'network_address_int', 'broadcast_address_int', '_host_size')
+    ip: IP
+    prefix_length: int
+    netmask_int: int
+    network_address_int: int
+    broadcast_address_int: int
+    _host_size: int
+
     @staticmethod
     def count_leading_zeros(num: int, bits: int = 32) -> int:
         """
@@ -102,45 +142,52 @@ class Network:
         """
         if num == 0:
             return bits
-        
-        count = 0
-        mask = 1 << (bits - 1)
-        
-        while mask > 0 and not (num & mask):
-            count += 1
-            mask >>= 1
-            
-        return count
+        return bits - num.bit_length()
 
     @staticmethod
     def find_optimal_prefix(start: int, end: int, bits: int = 32) -> int:
         """
         Намира оптималния префикс използвайки CLZ
+        Връща дължината на общия префикс на start и end
         """
-        if start == end:
-            return bits
-            
-        diff = start ^ end  # XOR за намиране на различаващите се битове
-        return bits - (bits - Network.count_leading_zeros(diff, bits))
+        # XOR за намиране на различаващите се битове; при start == end е 0 и CLZ връща bits
+        return Network.count_leading_zeros(start ^ end, bits)
 
-    def __init__(self, network_str: str):
-        """Инициализира мрежа от CIDR нотация"""
+    def __init__(self, network: Union[str, IP], prefix_length: Optional[int] = None) -> None:
+        """
+        Инициализира мрежа от CIDR нотация
+        Ако се подаде готов IP обект и префикс, парсването на стринг се пропуска
+        """
+        if isinstance(network, IP):
+            if prefix_length is None:
+                raise ValueError("Липсва дължина на префикса")
+            if not (0 <= prefix_length <= network._bits):
+                raise ValueError(f"Префиксът трябва да бъде между 0 и {network._bits}")
+            self.ip = network
+            self.prefix_length = prefix_length
+            self._calculate_network_values()
+            return
+        if prefix_length is not None:
+            raise TypeError("prefix_length се подава само заедно с IP обект; CIDR стрингът вече съдържа префикса")
+        network_str = network
         try:
-            # Проверка за валиден CIDR формат
-            if '/' not in network_str:
-                raise ValueError("Моля, въведете IP адрес с префикс (пример: 192.168.1.0/24 или 2001:db8::/32)")
+            # Проверка за валиден CIDR формат с едно минаване през стринга
+            match = _CIDR_RE.fullmatch(network_str)
+            if match is None:
+                # Бавният път се използва само за по-точно съобщение за грешка
+                if '/' not in network_str:
+                    raise ValueError("Моля, въведете IP адрес с префикс (пример: 192.168.1.0/24 или 2001:db8::/32)")
+                if not network_str.rsplit('/', 1)[1].isdigit():
+                    raise ValueError("Префиксът трябва да бъде число")
+                raise ValueError("Невалиден CIDR формат. Моля, използвайте формат IP/префикс (пример: 192.168.1.0/24)")
             
-            ip_str, prefix_str = network_str.split('/')
-            
-            # Валидация на префикса
-            if not prefix_str.isdigit():
-                raise ValueError("Префиксът трябва да бъде число")
+            ip_str, prefix_str = match.groups()
             
             self.ip = IP(ip_str)
             self.prefix_length = int(prefix_str)
             
             # Проверка за валиден диапазон на префикса
-            max_prefix = 32 if self.ip.version == 4 else 128
+            max_prefix = self.ip._bits
             if not (0 <= self.prefix_length <= max_prefix):
                 raise ValueError(f"Префиксът трябва да бъде между 0 и {max_prefix}")
             
@@ -151,95 +198,164 @@ class Network:
         except Exception as e:
             raise ValueError(f"Невалиден CIDR формат. Моля, използвайте формат IP/префикс (пример: 192.168.1.0/24)")
 
-    def _calculate_network_values(self):
+    def _calculate_network_values(self) -> None:
         """Изчислява мрежова маска, мрежов и broadcast адреси"""
-        bits = 32 if self.ip.version == 4 else 128
-        self.netmask_int = ((1 << bits) - 1) ^ ((1 << (bits - self.prefix_length)) - 1)
+        if self.ip.version == 4:
+            self.netmask_int = _V4_NETMASK[self.prefix_length]
+            self._host_size = _V4_HOSTSIZE[self.prefix_length]
+        else:
+            self.netmask_int = _V6_NETMASK[self.prefix_length]
+            self._host_size = _V6_HOSTSIZE[self.prefix_length]
         self.network_address_int = self.ip.ip_int & self.netmask_int
-        self.broadcast_address_int = self.network_address_int | ((1 << (bits - self.prefix_length)) - 1)
+        self.broadcast_address_int = self.network_address_int | (self._host_size - 1)
 
     def get_network_address(self) -> str:
         """Връща мрежовия адрес"""
-        if self.ip.version == 4:
-            return IP._int_to_ipv4_str(self.network_address_int)
-        return IP._int_to_ipv6_str(self.network_address_int)
+        return self.ip._to_str(self.network_address_int)
 
     def get_broadcast_address(self) -> str:
         """Връща broadcast адреса"""
-        if self.ip.version == 4:
-            return IP._int_to_ipv4_str(self.broadcast_address_int)
-        return IP._int_to_ipv6_str(self.broadcast_address_int)
+        return self.ip._to_str(self.broadcast_address_int)
 
     def get_netmask(self) -> str:
         """Връща мрежовата маска"""
-        if self.ip.version == 4:
-            return IP._int_to_ipv4_str(self.netmask_int)
-        return IP._int_to_ipv6_str(self.netmask_int)
+        return self.ip._to_str(self.netmask_int)
 
     def get_first_usable(self) -> str:
         """Връща първия използваем IP адрес"""
-        if self.ip.version == 4:
-            return IP._int_to_ipv4_str(self.network_address_int + 1)
-        return IP._int_to_ipv6_str(self.network_address_int + 1)
+        return self.ip._to_str(self.network_address_int + 1)
 
     def get_last_usable(self) -> str:
         """Връща последния използваем IP адрес"""
-        if self.ip.version == 4:
-            return IP._int_to_ipv4_str(self.broadcast_address_int - 1)
-        return IP._int_to_ipv6_str(self.broadcast_address_int - 1)
+        return self.ip._to_str(self.broadcast_address_int - 1)
 
     def get_num_addresses(self) -> int:
         """Връща броя на адресите в мрежата"""
-        return 1 << (32 if self.ip.version == 4 else 128) - self.prefix_length
+        return self._host_size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Network):
+            return NotImplemented
+        return (self.ip.version == other.ip.version
+                and self.network_address_int == other.network_address_int
+                and self.prefix_length == other.prefix_length)
+
+    def __hash__(self) -> int:
+        return hash((self.ip.version, self.network_address_int, self.prefix_length))
+
+def _block_prefix(start: int, end: int, bits: int) -> int:
+    """
+    Префиксът на най-големия блок, който започва от start и се побира до end (start <= end)
+    Размерът е ограничен от подравняването на start (броя нули в края)
+    и от дължината на диапазона
+    """
+    align_bits = (start & -start).bit_length() - 1 if start else bits
+    size_bits = (end - start + 1).bit_length() - 1
+    return bits - (align_bits if align_bits < size_bits else size_bits)
+
+def _summarize_range(start: int, end: int, bits: int = 32) -> List[Tuple[int, int]]:
+    """
+    Целочислено ядро на обобщаването на диапазон
+    Връща двойки (мрежов адрес, префикс) за блоковете между start и end
+    """
+    blocks = []
+    current_ip = start
+
+    while current_ip <= end:
+        prefix = _block_prefix(current_ip, end, bits)
+        blocks.append((current_ip, prefix))
+
+        # Преминаваме към следващия блок
+        current_ip += 1 << (bits - prefix)
+
+    return blocks
+
+def _index_address(value: SupportsIndex, limit: int) -> int:
+    """Превръща стойност в цяло число и проверява, че е адрес между 0 и limit"""
+    # operator.index приема и целочислени типове като numpy.int64, но не float;
+    # bool е подклас на int, но не е валиден адрес
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = operator.index(value)
+    except TypeError:
+        raise ValueError(f"Адресите трябва да бъдат цели числа, получено: {value!r}") from None
+    if not (0 <= number <= limit):
+        raise ValueError(f"Адресите трябва да бъдат между 0 и {limit}")
+    return number
+
+def bulk_summarize(starts: Sequence[SupportsIndex], ends: Sequence[SupportsIndex], bits: int = 32) -> List[List[Tuple[int, int]]]:
+    """
+    Обобщава наведнъж много диапазона, подадени като две успоредни
+    последователности от цели числа (начала и краища)
+    Връща по един списък от двойки (мрежов адрес, префикс) за всеки диапазон
+    При невалиден вход хвърля ValueError
+    """
+    if bits != 32 and bits != 128:
+        raise ValueError("Броят битове трябва да бъде 32 (IPv4) или 128 (IPv6)")
+    if len(starts) != len(ends):
+        raise ValueError("Броят на началните и крайните адреси трябва да е еднакъв")
+
+    limit = (1 << bits) - 1
+    results = []
+    for start_value, end_value in zip(starts, ends):
+        start = _index_address(start_value, limit)
+        end = _index_address(end_value, limit)
+        if start > end:
+            start, end = end, start
+        results.append(_summarize_range(start, end, bits))
+    return results
+
+def _parse_range(start_ip_str: str, end_ip_str: str) -> Tuple[IP, IP]:
+    """Парсва двата края на диапазон и ги подрежда във възходящ ред"""
+    start_ip = IP(start_ip_str)
+    end_ip = IP(end_ip_str)
+
+    if start_ip.version != end_ip.version:
+        raise ValueError("IP адресите трябва да са от един и същ тип")
+
+    if start_ip > end_ip:
+        start_ip, end_ip = end_ip, start_ip
+    return start_ip, end_ip
+
+def find_optimal_cidrs_objs(start_ip_str: str, end_ip_str: str) -> List[Network]:
+    """
+    Като find_optimal_cidrs, но връща готови Network обекти,
+    за да не се парсват отново CIDR стринговете при извеждане
+    При невалиден вход хвърля ValueError
+    """
+    start_ip, end_ip = _parse_range(start_ip_str, end_ip_str)
+    version = start_ip.version
+    blocks = _summarize_range(start_ip.ip_int, end_ip.ip_int, start_ip._bits)
+    return [Network(IP(network_int, version), prefix) for network_int, prefix in blocks]
 
 def find_optimal_cidrs(start_ip_str: str, end_ip_str: str) -> List[str]:
-    """Намира оптималните CIDR блокове между два IP адреса използвайки CLZ"""
+    """Намира оптималните CIDR блокове между два IP адреса с побитови операции (CTZ и bit_length)"""
     try:
-        start_ip = IP(start_ip_str)
-        end_ip = IP(end_ip_str)
-
-        if start_ip.version != end_ip.version:
-            raise ValueError("IP адресите трябва да са от един и същ тип")
-
-        if start_ip > end_ip:
-            start_ip, end_ip = end_ip, start_ip
+        start_ip, end_ip = _parse_range(start_ip_str, end_ip_str)
 
-        result = []
-        current_ip = start_ip.ip_int
-        end_ip_int = end_ip.ip_int
-        bits = 32 if start_ip.version == 4 else 128
-
-        while current_ip <= end_ip_int:
-            # Използваме CLZ за намиране на оптималния префикс
-            prefix = Network.find_optimal_prefix(current_ip, end_ip_int, bits)
-            
-            # Намираме маската за текущия префикс
-            mask = ((1 << bits) - 1) ^ ((1 << (bits - prefix)) - 1)
-            
-            # Намираме началото на мрежата
-            network_start = current_ip & mask
-            
-            # Проверяваме дали мрежата започва от текущия IP
-            while network_start < current_ip:
-                prefix += 1
-                if prefix > bits:
-                    break
-                mask = ((1 << bits) - 1) ^ ((1 << (bits - prefix)) - 1)
-                network_start = current_ip & mask
-
-            if start_ip.version == 4:
-                result.append(f"{IP._int_to_ipv4_str(current_ip)}/{prefix}")
-            else:
-                result.append(f"{IP._int_to_ipv6_str(current_ip)}/{prefix}")
-
-            # Преминаваме към следващия блок
-            current_ip = (current_ip & ((1 << bits) - (1 << (bits - prefix)))) + (1 << (bits - prefix))
-
-        return result
+        # Адресите остават цели числа; стринг се прави само веднъж за всеки блок
+        to_str = start_ip._to_str
+        blocks = _summarize_range(start_ip.ip_int, end_ip.ip_int, start_ip._bits)
+        return [f"{to_str(network_int)}/{prefix}" for network_int, prefix in blocks]
     except ValueError as e:
         return [f"Грешка: {str(e)}"]
 
-def print_banner():
+def find_optimal_cidrs_batch(starts: Sequence[SupportsIndex], ends: Sequence[SupportsIndex], bits: int = 32) -> List[List[str]]:
+    """
+    Намира оптималните CIDR блокове за много диапазона наведнъж
+    Диапазоните се подават като цели числа (bits=32 за IPv4, 128 за IPv6);
+    връща по един списък с CIDR блокове за всеки диапазон, в реда на подаване
+    При невалиден вход хвърля ValueError
+    """
+    blocks_per_range = bulk_summarize(starts, ends, bits)
+    to_str = IP._int_to_ipv4_str if bits == 32 else IP._int_to_ipv6_str
+    return [
+        [f"{to_str(network_int)}/{prefix}" for network_int, prefix in blocks]
+        for blocks in blocks_per_range
+    ]
+
+def print_banner() -> None:
     """Отпечатва банер на програмата"""
     print("\033[95m")  # Лилав цвят
     print("╔═════════════════════════════════════════════════╗")
@@ -249,42 +365,68 @@ def print_banner():
     print("╚═════════════════════════════════════════════════╝")
     print("\033[0m")
 
-def analyze_network(cidr: str) -> Dict[str, Union[str, int]]:
-    """Анализира CIDR нотация и връща информация за мрежата"""
+# Построители на полетата от analyze_network, в реда на извеждане
+_FIELD_BUILDERS: Dict[str, Callable[[Network], Union[str, int]]] = {
+    "IP версия": lambda network: "IPv6" if network.ip.version == 6 else "IPv4",
+    "Мрежов адрес": Network.get_network_address,
+    "Broadcast адрес": Network.get_broadcast_address,
+    "Мрежова маска": Network.get_netmask,
+    "Префикс": lambda network: network.prefix_length,
+    "Брой адреси": Network.get_num_addresses,
+    "Първи използваем": Network.get_first_usable,
+    "Последен използваем": Network.get_last_usable,
+    "Маска (двоично)": lambda network: (f'{network.netmask_int:032b}' if network.ip.version == 4
+                                        else f'{network.netmask_int:0128b}'),
+}
+
+def analyze_network(cidr: Optional[str], *, fields: Optional[Iterable[str]] = None) -> Mapping[str, Union[str, int]]:
+    """
+    Анализира CIDR нотация и връща информация за мрежата
+    С fields се изчисляват само посочените полета; непознато име хвърля ValueError
+    Резултатите се кешират, затова се връщат като непроменими речници
+    """
+    # Нестрингов вход също се връща като грешка, вместо да хвърли при strip()
+    if not isinstance(cidr, str):
+        return MappingProxyType({"error": "Моля, въведете CIDR нотация"})
+
+    field_set: Optional[FrozenSet[str]] = None
+    if fields is not None:
+        # Един стринг би се разбил на отделни символи, затова се отхвърля изрично
+        if isinstance(fields, str):
+            raise TypeError("fields трябва да бъде колекция от имена на полета, а не стринг")
+        field_set = frozenset(fields)
+        unknown = field_set.difference(_FIELD_BUILDERS)
+        if unknown:
+            raise ValueError(f"Непознати полета: {', '.join(sorted(unknown))}")
+
+    # Нормализираме входа преди кеша, за да споделят запис " 10.0.0.0/8" и "10.0.0.0/8"
+    return _analyze_network(cidr.strip(), field_set)
+
+@lru_cache(maxsize=4096)
+def _analyze_network(cidr: str, fields: Optional[FrozenSet[str]]) -> Mapping[str, Union[str, int]]:
+    """Кеширана част на analyze_network; очаква вече нормализиран вход"""
     try:
         # Базова валидация на входа
-        cidr = cidr.strip()
         if not cidr:
-            return {"error": "Моля, въведете CIDR нотация"}
+            return MappingProxyType({"error": "Моля, въведете CIDR нотация"})
         
         # Проверка за правилен формат
         if '/' not in cidr:
-            return {"error": "Моля, въведете IP адрес с префикс (пример: 192.168.1.0/24 или 2001:db8::/32)"}
+            return MappingProxyType({"error": "Моля, въведете IP адрес с префикс (пример: 192.168.1.0/24 или 2001:db8::/32)"})
         
         network = Network(cidr)
         info = {
-            "IP версия": "IPv6" if network.ip.version == 6 else "IPv4",
-            "Мрежов адрес": network.get_network_address(),
-            "Broadcast адрес": network.get_broadcast_address(),
-            "Мрежова маска": network.get_netmask(),
-            "Префикс": network.prefix_length,
-            "Брой адреси": network.get_num_addresses(),
-            "Първи използваем": network.get_first_usable(),
-            "Последен използваем": network.get_last_usable()
+            label: build(network)
+            for label, build in _FIELD_BUILDERS.items()
+            if fields is None or label in fields
         }
-        
-        if network.ip.version == 4:
-            info["Маска (двоично)"] = format(network.netmask_int, '032b')
-        else:
-            info["Маска (двоично)"] = format(network.netmask_int, '0128b')
-            
-        return info
+        return MappingProxyType(info)
     except ValueError as e:
-        return {"error": str(e)}
+        return MappingProxyType({"error": str(e)})
     except Exception as e:
-        return {"error": f"Възникна грешка: {str(e)}"}
+        return MappingProxyType({"error": f"Възникна грешка: {str(e)}"})
 
-def main():
+def main() -> None:
     print_banner()
 
     while True:
@@ -308,7 +450,7 @@ def main():
                 continue
 
             print("\n\033[92mИнформация за мрежата:\033[0m")
-            print("-" * 40)
+            print(_DIV40)
             for key, value in info.items():
                 print(f"\033[96m{key}:\033[0m {value}")
 
@@ -316,24 +458,30 @@ def main():
             start_ip = input("\nВъведете начален IP адрес: ").strip()
             end_ip = input("Въведете краен IP адрес: ").strip()
             
-            cidrs = find_optimal_cidrs(start_ip, end_ip)
-            
-            if cidrs and cidrs[0].startswith("Грешка"):
-                print(f"\n\033[91m{cidrs[0]}\033[0m")
+            try:
+                networks = find_optimal_cidrs_objs(start_ip, end_ip)
+            except ValueError as e:
+                print(f"\n\033[91mГрешка: {str(e)}\033[0m")
                 continue
 
             print("\n\033[92mОптимални CIDR блокове:\033[0m")
-            print("-" * 40)
+            print(_DIV40)
             
-            for i, cidr in enumerate(cidrs, 1):
-                print(f"\n\033[96mБлок {i}:\033[0m")
-                info = analyze_network(cidr)
-                print(f"CIDR: {cidr}")
-                print(f"Мрежов адрес: {info['Мрежов адрес']}")
-                print(f"Broadcast адрес: {info['Broadcast адрес']}")
-                print(f"Брой адреси: {info['Брой адреси']}")
-                print(f"Първи използваем: {info['Първи използваем']}")
-                print(f"Последен използваем: {info['Последен използваем']}")
+            # Всички блокове се сглобяват и извеждат с едно писане в stdout
+            lines = []
+            for i, network in enumerate(networks, 1):
+                network_address = network.get_network_address()
+                lines.append(
+                    f"\n\033[96mБлок {i}:\033[0m\n"
+                    f"CIDR: {network_address}/{network.prefix_length}\n"
+                    f"Мрежов адрес: {network_address}\n"
+                    f"Broadcast адрес: {network.get_broadcast_address()}\n"
+                    f"Брой адреси: {network.get_num_addresses()}\n"
+                    f"Първи използваем: {network.get_first_usable()}\n"
+                    f"Последен използваем: {network.get_last_usable()}"
+                )
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
 
         else:
             print("\n\033[91mНевалиден избор. Моля, изберете 1, 2 или 3.\033[0m")